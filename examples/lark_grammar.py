@@ -29,7 +29,7 @@ grammar_files = [
 
 def test():
     for grammar_file in grammar_files:
-        tree = parser.parse(open(grammar_file).read())
+        tree = parser.parse(grammar_file.read_text())
     print("All grammars parsed successfully")
 
 if __name__ == '__main__':
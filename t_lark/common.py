@@ -14,7 +14,7 @@ if TYPE_CHECKING:
     else:
         from typing_extensions import TypeAlias
 
-from .utils import Serialize
+from .utils import Serialize, _getstate_by_module_name, _setstate_by_module_name
 from .lexer import TerminalDef, Token
 
 ###{standalone
@@ -69,6 +69,18 @@ class LexerConf(Serialize):
             deepcopy(self.use_bytes, memo),
         )
 
+    def __copy__(self):
+        # copy() would otherwise go through __getstate__, and pay for the module-name round trip meant for pickling
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
+    def __getstate__(self):
+        return _getstate_by_module_name(self)
+
+    def __setstate__(self, state):
+        _setstate_by_module_name(self, state)
+
 class ParserConf(Serialize):
     __serialize_fields__ = 'rules', 'start', 'parser_type'
 
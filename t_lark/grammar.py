@@ -16,6 +16,8 @@ class Symbol(Serialize):
         self.name = name
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Symbol):
             return NotImplemented
         return self.is_term == other.is_term and self.name == other.name
@@ -36,8 +38,11 @@ class Symbol(Serialize):
 
 
 class Terminal(Symbol):
+    __slots__ = ('filter_out',)
+
     __serialize_fields__ = 'name', 'filter_out'
 
+    filter_out: bool
     is_term: ClassVar[bool] = True
 
     def __init__(self, name: str, filter_out: bool = False) -> None:
@@ -53,6 +58,8 @@ class Terminal(Symbol):
 
 
 class NonTerminal(Symbol):
+    __slots__ = ()
+
     __serialize_fields__ = 'name',
 
     is_term: ClassVar[bool] = False
@@ -64,6 +71,8 @@ class NonTerminal(Symbol):
 
 
 class RuleOptions(Serialize):
+    __slots__ = ('keep_all_tokens', 'expand1', 'priority', 'template_source', 'empty_indices')
+
     __serialize_fields__ = 'keep_all_tokens', 'expand1', 'priority', 'template_source', 'empty_indices'
 
     keep_all_tokens: bool
@@ -94,7 +103,7 @@ class Rule(Serialize):
         expansion : a list of symbols
         order : index of this expansion amongst all rules of the same name
     """
-    __slots__ = ('origin', 'expansion', 'alias', 'options', 'order', '_hash')
+    __slots__ = ('origin', 'expansion', 'alias', 'options', 'order', '_hash', '_str')
 
     __serialize_fields__ = 'origin', 'expansion', 'order', 'alias', 'options'
     __serialize_namespace__ = Terminal, NonTerminal, RuleOptions
@@ -105,6 +114,7 @@ class Rule(Serialize):
     alias: Optional[str]
     options: RuleOptions
     _hash: int
+    _str: Optional[str]
 
     def __init__(self, origin: NonTerminal, expansion: Sequence[Symbol],
                  order: int=0, alias: Optional[str]=None, options: Optional[RuleOptions]=None):
@@ -113,13 +123,22 @@ class Rule(Serialize):
         self.alias = alias
         self.order = order
         self.options = options or RuleOptions()
-        self._hash = hash((self.origin, tuple(self.expansion)))
+        # Avoid copying expansions that are already tuples
+        self._hash = hash((origin, expansion if type(expansion) is tuple else tuple(expansion)))
+        self._str = None
 
     def _deserialize(self):
-        self._hash = hash((self.origin, tuple(self.expansion)))
+        expansion = self.expansion
+        self._hash = hash((self.origin, expansion if type(expansion) is tuple else tuple(expansion)))
+        self._str = None
 
     def __str__(self):
-        return '<%s : %s>' % (self.origin.name, ' '.join(x.name for x in self.expansion))
+        # Cached, since error reporting and debug output stringify the same rules repeatedly.
+        # __repr__ isn't cached, because it includes options that may be edited in place.
+        s = self._str
+        if s is None:
+            s = self._str = '<%s : %s>' % (self.origin.name, ' '.join(x.name for x in self.expansion))
+        return s
 
     def __repr__(self):
         return 'Rule(%r, %r, %r, %r)' % (self.origin, self.expansion, self.alias, self.options)
@@ -128,8 +147,13 @@ class Rule(Serialize):
         return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Rule):
             return False
+        # Compare the stored hashes first, to reject most unequal rules without walking the symbols
+        if self._hash != other._hash:
+            return False
         return self.origin == other.origin and self.expansion == other.expansion
 
 
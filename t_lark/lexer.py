@@ -16,7 +16,10 @@ if TYPE_CHECKING:
     from .common import LexerConf
     from .parsers.lalr_parser_state import ParserState
 
-from .utils import classify, get_regexp_width, Serialize, logger, TextSlice, TextOrSlice
+from .utils import (
+    classify, get_regexp_width, Serialize, logger, TextSlice, TextOrSlice,
+    _getstate_by_module_name, _setstate_by_module_name,
+)
 from .exceptions import UnexpectedCharacters, LexError, UnexpectedToken
 from .grammar import TOKEN_DEFAULT_PRIORITY
 
@@ -410,6 +413,12 @@ class Scanner:
 
         self._mres = self._build_mres(terminals, len(terminals))
 
+    def __getstate__(self):
+        return _getstate_by_module_name(self)
+
+    def __setstate__(self, state):
+        _setstate_by_module_name(self, state)
+
     def _build_mres(self, terminals, max_size):
         # Python sets an unreasonable group limit (currently 100) in its re module
         # Worse, the only way to know we reached it is by catching an AssertionError!
@@ -643,6 +652,12 @@ class BasicLexer(AbstractBasicLexer):
 
         return Scanner(terminals, self.g_regex_flags, self.re, self.use_bytes)
 
+    def __getstate__(self):
+        return _getstate_by_module_name(self)
+
+    def __setstate__(self, state):
+        _setstate_by_module_name(self, state)
+
     @property
     def scanner(self) -> Scanner:
         if self._scanner is None:
@@ -724,9 +739,10 @@ class ContextualLexer(Lexer):
         self.root_lexer = self.BasicLexer(trad_conf, comparator)
 
     def lex(self, lexer_state: LexerState, parser_state: 'ParserState') -> Iterator[Token]:
+        lexers = self.lexers
         try:
             while True:
-                lexer = self.lexers[parser_state.position]
+                lexer = lexers[parser_state.position]
                 yield lexer.next_token(lexer_state, parser_state)
         except EOFError:
             pass
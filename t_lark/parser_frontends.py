@@ -1,12 +1,13 @@
 from functools import lru_cache
 from importlib import import_module
-from typing import Any, Callable, Dict, Optional, Collection, Union, TYPE_CHECKING
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Collection, Set, Tuple, Union, TYPE_CHECKING
 
 from .exceptions import ConfigurationError, GrammarError, UnexpectedInput, UnexpectedToken, assert_config
-from .utils import get_regexp_width, Serialize, TextOrSlice, TextSlice
+from .utils import Serialize, TextOrSlice, TextSlice
 from .lexer import LexerThread, BasicLexer, ContextualLexer, Lexer, Token, PatternPlaceholder
 from .parsers import earley, xearley, cyk
 from .parsers.lalr_parser import LALR_Parser
+from .parsers.grammar_analysis import validate_rules
 from .tree import Tree
 from .common import LexerConf, ParserConf, _ParserArgType, _LexerArgType
 from .template_mode import (
@@ -19,6 +20,7 @@ from .template_mode import (
 
 if TYPE_CHECKING:
     from .parsers.lalr_analysis import ParseTableBase
+    from .lark import PostLex
 
 
 ###{standalone
@@ -27,6 +29,17 @@ from functools import lru_cache
 from importlib import import_module
 
 def _wrap_lexer(lexer_class):
+    # Stored on the lexer class itself, so that every frontend using the same custom lexer shares one wrapper class,
+    # and the wrapper is freed along with the lexer class. Subclasses don't inherit it, since they get their own wrapper.
+    wrapper = lexer_class.__dict__.get('__lark_wrapper__')
+    if wrapper is None:
+        wrapper = _make_lexer_wrapper(lexer_class)
+        if wrapper is not lexer_class:
+            lexer_class.__lark_wrapper__ = wrapper
+    return wrapper
+
+
+def _make_lexer_wrapper(lexer_class):
     future_interface = getattr(lexer_class, '__future_interface__', 0)
     if future_interface == 2:
         return lexer_class
@@ -37,7 +50,6 @@ def _wrap_lexer(lexer_class):
             def lex(self, lexer_state, parser_state):
                 if not lexer_state.text.is_complete_text():
                     raise TypeError("Interface=1 Custom Lexer don't support TextSlice")
-                lexer_state.text = lexer_state.text
                 return self.lexer.lex(lexer_state, parser_state)
         return CustomLexerWrapper1
     elif future_interface == 0:
@@ -54,9 +66,14 @@ def _wrap_lexer(lexer_class):
         raise ValueError(f"Unknown __future_interface__ value {future_interface}, integer 0-2 expected")
 
 
+def _plugin_class(options, name: str, default):
+    "Returns the class registered for `name` in options._plugins, or `default` if there isn't one"
+    return (options and options._plugins.get(name)) or default
+
+
 def _deserialize_parsing_frontend(data, memo, lexer_conf, callbacks, options):
     parser_conf = ParserConf.deserialize(data['parser_conf'], memo)
-    cls = (options and options._plugins.get('LALR_Parser')) or LALR_Parser
+    cls = _plugin_class(options, 'LALR_Parser', LALR_Parser)
     parser = cls.deserialize(data['parser'], memo, callbacks, options.debug)
     parser_conf.callbacks = callbacks
     return ParsingFrontend(lexer_conf, parser_conf, options, parser=parser)
@@ -64,6 +81,13 @@ def _deserialize_parsing_frontend(data, memo, lexer_conf, callbacks, options):
 
 _parser_creators: 'Dict[str, Callable[[LexerConf, Any, Any], Any]]' = {}
 
+
+def _prepare_start(start_decls: 'List[str]') -> 'Tuple[Optional[str], FrozenSet[str]]':
+    "Returns the implicit start rule (if there's exactly one), and the set of valid start rules"
+    default_start = start_decls[0] if len(start_decls) == 1 else None
+    return default_start, frozenset(start_decls)
+
+
 @lru_cache(maxsize=1)
 def _string_template_type() -> Optional[type[Any]]:
     try:
@@ -77,6 +101,8 @@ def _string_template_type() -> Optional[type[Any]]:
 
 
 class ParsingFrontend(Serialize):
+    __slots__ = ('lexer_conf', 'parser_conf', 'options', 'parser', 'lexer', 'skip_lexer',
+                 '_default_start', '_start_set', '_lexer_thread_cls')
     __serialize_fields__ = 'lexer_conf', 'parser_conf', 'parser'
 
     lexer_conf: LexerConf
@@ -87,6 +113,8 @@ class ParsingFrontend(Serialize):
         self.parser_conf = parser_conf
         self.lexer_conf = lexer_conf
         self.options = options
+        self._default_start, self._start_set = _prepare_start(parser_conf.start)
+        self._lexer_thread_cls = _plugin_class(options, 'LexerThread', LexerThread)
 
         # Set-up parser
         if parser:  # From cache
@@ -110,10 +138,7 @@ class ParsingFrontend(Serialize):
             assert issubclass(lexer_type, Lexer)
             self.lexer = _wrap_lexer(lexer_type)(lexer_conf)
         elif isinstance(lexer_type, str):
-            create_lexer = {
-                'basic': create_basic_lexer,
-                'contextual': create_contextual_lexer,
-            }[lexer_type]
+            create_lexer = _lexer_creators[lexer_type]
             self.lexer = create_lexer(lexer_conf, self.parser, lexer_conf.postlex, options)
         else:
             raise TypeError("Bad value for lexer_type: {lexer_type}")
@@ -123,25 +148,25 @@ class ParsingFrontend(Serialize):
 
     def _verify_start(self, start=None):
         if start is None:
-            start_decls = self.parser_conf.start
-            if len(start_decls) > 1:
-                raise ConfigurationError("Lark initialized with more than 1 possible start rule. Must specify which start rule to parse", start_decls)
-            start ,= start_decls
-        elif start not in self.parser_conf.start:
+            start = self._default_start
+            if start is None:
+                raise ConfigurationError("Lark initialized with more than 1 possible start rule. Must specify which start rule to parse", self.parser_conf.start)
+        elif start not in self._start_set:
             raise ConfigurationError("Unknown start rule %s. Must be one of %r" % (start, self.parser_conf.start))
         return start
 
     def _make_lexer_thread(self, text: Optional[TextOrSlice]) -> Union[TextOrSlice, LexerThread, None]:
-        cls = (self.options and self.options._plugins.get('LexerThread')) or LexerThread
+        cls = self._lexer_thread_cls
         return text if self.skip_lexer else cls(self.lexer, None) if text is None else cls.from_text(self.lexer, text)
 
     def parse(self, text: Optional[TextOrSlice], start=None, on_error=None):
-        if self.lexer_conf.lexer_type in ("dynamic", "dynamic_complete"):
-            if isinstance(text, TextSlice) and not text.is_complete_text():
-                raise TypeError(f"Lexer {self.lexer_conf.lexer_type} does not support text slices.")
-
         chosen_start = self._verify_start(start)
         kw = {} if on_error is None else {'on_error': on_error}
+        if self.skip_lexer:
+            # Only the dynamic lexers skip lexing, and they scan the whole text
+            if isinstance(text, TextSlice) and not text.is_complete_text():
+                raise TypeError(f"Lexer {self.lexer_conf.lexer_type} does not support text slices.")
+            return self.parser.parse(text, chosen_start, **kw)
         stream = self._make_lexer_thread(text)
         return self.parser.parse(stream, chosen_start, **kw)
 
@@ -158,29 +183,116 @@ class ParsingFrontend(Serialize):
 class _StringLexer:
     """Minimal lexer wrapper for template frontend when parsing plain strings."""
 
-    def __init__(self, lexer_conf: LexerConf, text: TextSlice) -> None:
-        self._lexer = basic_lexer_for_static(lexer_conf)
-        self._thread = LexerThread.from_text(self._lexer, text)
-        self._postlex = lexer_conf.postlex
-        self._used = False
+    __slots__ = ('_lexer', '_thread', '_postlex')
+
+    def __init__(self, lexer: BasicLexer, postlex: 'Optional[PostLex]', text: TextOrSlice) -> None:
+        self._lexer = lexer
+        self._thread: Optional[LexerThread] = LexerThread.from_text(lexer, text)
+        self._postlex = postlex
 
     def lex(self, parser_state):
-        if self._used:
+        thread = self._thread
+        if thread is None:      # Already consumed
             return iter(())
-        self._used = True
-        tokens = self._thread.lex(parser_state)
+        self._thread = None
+        tokens = thread.lex(parser_state)
         if self._postlex is not None:
             tokens = self._postlex.process(tokens)
         return tokens
 
 
+# Terminal kinds, as classified by TemplateEarleyFrontend._classify_term
+_TERM_PLAIN = 0
+_TERM_PYOBJ = 1
+_TERM_TYPED_PYOBJ = 2
+_TERM_TREE = 3
+_TERM_NEVER = 4
+
+
+class _TemplateTermMatcher:
+    """Earley term matcher for template tokens.
+
+    A class rather than a closure, so that the frontend holding it can be pickled.
+    """
+
+    __slots__ = ('frontend', 'typed_by_name', 'term_kinds', 'plain_names')
+
+    def __init__(self, frontend: 'TemplateEarleyFrontend') -> None:
+        self.frontend = frontend
+        self.typed_by_name = frontend.typed_terminals_by_name
+        # Terminal metadata is fixed after construction, so each name is classified only once.
+        # Most terminals are plain, and only need their type compared; the rest keep their record in term_kinds.
+        self.plain_names: Set[str] = set()
+        self.term_kinds: Dict[str, Tuple[int, Any, Any]] = {}
+        for t in frontend.lexer_conf.terminals:
+            self._classify(t.name)
+
+    def _classify(self, term_name: str) -> None:
+        record = self.frontend._classify_term(term_name)
+        if record[0] == _TERM_PLAIN:
+            self.plain_names.add(term_name)
+        else:
+            self.term_kinds[term_name] = record
+
+    def __call__(self, term, token) -> bool:
+        # Lexed and interpolated tokens are exact Token instances, so isinstance() is rarely needed
+        if type(token) is not Token and not isinstance(token, Token):
+            return False
+
+        term_name = term.name
+        if term_name in self.plain_names:
+            return token.type == term_name
+
+        record = self.term_kinds.get(term_name)
+        if record is None:
+            # A terminal missing from lexer_conf.terminals; classify it, then match as usual
+            self._classify(term_name)
+            return self(term, token)
+        kind, arg, type_name = record
+
+        token_type = token.type
+        if kind == _TERM_PYOBJ:
+            if token_type == 'PYOBJ':
+                return True
+            if token_type in self.typed_by_name:
+                token.type = 'PYOBJ'
+                return True
+            return False
+
+        if kind == _TERM_TYPED_PYOBJ:
+            if token_type != 'PYOBJ' and token_type != term_name and token_type not in self.typed_by_name:
+                return False
+            # arg is the expected type (or tuple of types); only failures go through the frontend to raise
+            if arg is not None and not isinstance(token.value, arg):
+                self.frontend._check_pyobj_type(arg, type_name, token.value)
+            token.type = term_name
+            return True
+
+        if kind == _TERM_TREE:
+            if token_type != term_name:
+                return False
+            value = token.value
+            if type(value) is not Tree and not isinstance(value, Tree):
+                return False
+            return arg is None or value.data == arg
+
+        return False
+
+
 class TemplateEarleyFrontend:
     """Parsing frontend for Python template literals using the Earley parser."""
 
+    __slots__ = (
+        'lexer_conf', 'parser_conf', 'options', '_parser', '_parser_kwargs', '_default_start', '_start_set',
+        'tree_terminal_map', '_tree_terminal_inverse', 'pyobj_types', 'typed_terminals_by_type',
+        'typed_terminals_by_name', '_typed_expected_types', '_template_cls', '_static_lexer',
+    )
+
     def __init__(self, lexer_conf: LexerConf, parser_conf: ParserConf, options) -> None:
         self.lexer_conf = lexer_conf
         self.parser_conf = parser_conf
         self.options = options
+        self._default_start, self._start_set = _prepare_start(parser_conf.start)
 
         self.tree_terminal_map = dict(augment_grammar_for_template_mode(lexer_conf, parser_conf))
         self._tree_terminal_inverse = {terminal: label for label, terminal in self.tree_terminal_map.items()}
@@ -190,83 +302,63 @@ class TemplateEarleyFrontend:
 
         self.typed_terminals_by_type: Dict[str, str] = {}
         self.typed_terminals_by_name: Dict[str, str] = {}
-        self._typed_expected_types: Dict[str, type | tuple[type, ...]] = {}
 
         for termdef in lexer_conf.terminals:
-            pattern = getattr(termdef, 'pattern', None)
+            pattern = termdef.pattern
             if isinstance(pattern, PatternPlaceholder) and pattern.expected_type:
                 type_name = pattern.expected_type
                 self.typed_terminals_by_type[type_name] = termdef.name
                 self.typed_terminals_by_name[termdef.name] = type_name
 
-        missing = sorted(name for name in self.typed_terminals_by_type if name not in self.pyobj_types)
+        missing = self.typed_terminals_by_type.keys() - self.pyobj_types.keys()
         if missing:
-            raise ConfigurationError("Missing pyobj_types entries for typed placeholders: %s" % ', '.join(missing))
-
-        for term_name, type_name in self.typed_terminals_by_name.items():
-            self._typed_expected_types[term_name] = self.pyobj_types[type_name]
-
-        term_matcher = self._create_term_matcher()
-
-        from .parsers.earley import Parser as EarleyParser
-
-        resolve_ambiguity = options.ambiguity == 'resolve'
-        debug = options.debug if options else False
-        tree_class = options.tree_class or Tree if options.ambiguity != 'forest' else None
-
-        self.parser = EarleyParser(
-            lexer_conf,
-            parser_conf,
-            term_matcher,
-            resolve_ambiguity=resolve_ambiguity,
-            debug=debug,
-            tree_class=tree_class,
+            raise ConfigurationError("Missing pyobj_types entries for typed placeholders: %s" % ', '.join(sorted(missing)))
+
+        self._typed_expected_types: Dict[str, type | tuple[type, ...]] = {
+            term_name: self.pyobj_types[type_name] for term_name, type_name in self.typed_terminals_by_name.items()
+        }
+
+        self._template_cls = _string_template_type()
+        self._static_lexer: Optional[BasicLexer] = None
+
+        # The Earley grammar analysis dominates construction time, so it is deferred until the first parse.
+        # Only its cheap duplicate and undefined rule checks run here, so that errors surface at construction.
+        validate_rules(parser_conf)
+        self._parser: 'Optional[earley.Parser]' = None
+        self._parser_kwargs = dict(
+            resolve_ambiguity=options.ambiguity == 'resolve',
+            debug=options.debug if options else False,
+            tree_class=options.tree_class or Tree if options.ambiguity != 'forest' else None,
             ordered_sets=getattr(options, 'ordered_sets', True),
         )
 
-    def _create_term_matcher(self):
-        typed_by_name = self.typed_terminals_by_name
-        typed_expected = self._typed_expected_types
-
-        def term_match(term, token):
-            if not isinstance(token, Token):
-                return False
-
-            term_name = term.name
-
-            if term_name == 'PYOBJ':
-                if token.type == 'PYOBJ':
-                    return True
-                if token.type in typed_by_name:
-                    token.type = 'PYOBJ'
-                    return True
-                return False
-
-            if term_name.startswith('PYOBJ__'):
-                expected = typed_expected.get(term_name)
-                type_name = typed_by_name.get(term_name)
-
-                if type_name is None:
-                    return False
-
-                if token.type not in ('PYOBJ', term_name) and token.type not in typed_by_name:
-                    return False
-
-                self._check_pyobj_type(expected, type_name, token.value)
-                token.type = term_name
-                return True
-
-            if term_name.startswith('TREE__'):
-                if token.type != term_name:
-                    return False
-                if not isinstance(token.value, Tree):
-                    return False
-                expected_label = self._tree_terminal_inverse.get(term_name)
-                return expected_label is None or token.value.data == expected_label
-
-            return token.type == term_name
-
-        return term_match
+    @property
+    def parser(self) -> 'earley.Parser':
+        parser = self._parser
+        if parser is None:
+            parser = self._parser = earley.Parser(
+                self.lexer_conf, self.parser_conf, self._create_term_matcher(), **self._parser_kwargs
+            )
+        return parser
+
+    def warmup(self) -> None:
+        "Builds the Earley parser now, instead of on the first call to parse()"
+        self.parser
+
+    def _classify_term(self, term_name: str) -> Tuple[int, Any, Any]:
+        if term_name == 'PYOBJ':
+            return _TERM_PYOBJ, None, None
+        if term_name.startswith('PYOBJ__'):
+            type_name = self.typed_terminals_by_name.get(term_name)
+            if type_name is None:
+                return _TERM_NEVER, None, None
+            return _TERM_TYPED_PYOBJ, self._typed_expected_types.get(term_name), type_name
+        if term_name.startswith('TREE__'):
+            return _TERM_TREE, self._tree_terminal_inverse.get(term_name), None
+        return _TERM_PLAIN, None, None
+
+    def _create_term_matcher(self) -> '_TemplateTermMatcher':
+        return _TemplateTermMatcher(self)
 
     @staticmethod
     def _format_expected_type(expected: type | tuple[type, ...]) -> str:
@@ -284,21 +376,20 @@ class TemplateEarleyFrontend:
 
     def _verify_start(self, start=None):
         if start is None:
-            start_candidates = self.parser_conf.start
-            if len(start_candidates) > 1:
+            start = self._default_start
+            if start is None:
                 raise ConfigurationError(
                     "Lark initialized with more than 1 possible start rule. Must specify which start rule to parse",
-                    start_candidates,
+                    self.parser_conf.start,
                 )
-            start ,= start_candidates
-        elif start not in self.parser_conf.start:
+        elif start not in self._start_set:
             raise ConfigurationError(f"Unknown start rule {start}. Must be one of {self.parser_conf.start}")
         return start
 
     def parse(self, input_data, start=None, on_error=None):
         chosen_start = self._verify_start(start)
 
-        template_cls = _string_template_type()
+        template_cls = self._template_cls
 
         if template_cls is not None and isinstance(input_data, template_cls):
             lexer = self._tokenize_template(input_data)
@@ -323,15 +414,22 @@ class TemplateEarleyFrontend:
             typed_terminals=self.typed_terminals_by_type,
             pyobj_types=self.pyobj_types,
             source_info=getattr(template, 'source_info', None),
+            static_lexer=self._get_static_lexer(),
         )
         return tokenize_template(template, ctx)
 
     def _lex_string(self, text):
-        text_slice = TextSlice.cast_from(text)
-        return _StringLexer(self.lexer_conf, text_slice)
+        return _StringLexer(self._get_static_lexer(), self.lexer_conf.postlex, text)
+
+    def _get_static_lexer(self) -> BasicLexer:
+        # Lexers keep no per-text state, so one lexer (and its compiled scanner) serves every parse
+        lexer = self._static_lexer
+        if lexer is None:
+            lexer = self._static_lexer = basic_lexer_for_static(self.lexer_conf)
+        return lexer
 
     def _enhance_error(self, exc: UnexpectedInput, input_data) -> None:
-        template_cls = _string_template_type()
+        template_cls = self._template_cls
 
         if template_cls is None or not isinstance(input_data, template_cls):
             return
@@ -358,26 +456,47 @@ class TemplateEarleyFrontend:
             exc.args = (
                 f"Interpolated Tree('{label}') at {line}:{column} not valid in this context. Original: {original}",
             )
+
+
+_FRONTEND_LEXERS: 'Dict[str, Tuple[str, ...]]' = {
+    'lalr': ('basic', 'contextual'),
+    'earley': ('basic', 'dynamic', 'dynamic_complete', 'template'),
+    'cyk': ('basic', ),
+}
+_VALID_FRONTEND_ARGS = frozenset((parser, lexer) for parser, lexers in _FRONTEND_LEXERS.items() for lexer in lexers)
+
+
 def _validate_frontend_args(parser, lexer) -> None:
+    if (parser, lexer) in _VALID_FRONTEND_ARGS:
+        return
     assert_config(parser, ('lalr', 'earley', 'cyk'))
     if not isinstance(lexer, type):     # not custom lexer?
-        expected = {
-            'lalr': ('basic', 'contextual'),
-            'earley': ('basic', 'dynamic', 'dynamic_complete', 'template'),
-            'cyk': ('basic', ),
-         }[parser]
+        expected = _FRONTEND_LEXERS[parser]
         assert_config(lexer, expected, 'Parser %r does not support lexer %%r, expected one of %%s' % parser)
 
 
 def _get_lexer_callbacks(transformer, terminals):
+    if transformer is None:
+        return {}
+    names = [t.name for t in terminals]
+    cls = type(transformer)
+    if not hasattr(cls, '__getattr__') and cls.__getattribute__ is object.__getattribute__:
+        # Only probe the names that are actually defined, rather than a failing getattr() per terminal
+        defined = set(getattr(transformer, '__dict__', ()))
+        for klass in cls.__mro__:
+            defined.update(vars(klass))
+        names = [name for name in names if name in defined]
+
     result = {}
-    for terminal in terminals:
-        callback = getattr(transformer, terminal.name, None)
+    for name in names:
+        callback = getattr(transformer, name, None)
         if callback is not None:
-            result[terminal.name] = callback
+            result[name] = callback
     return result
 
 class PostLexConnector:
+    __slots__ = ('lexer', 'postlexer')
+
     def __init__(self, lexer, postlexer):
         self.lexer = lexer
         self.postlexer = postlexer
@@ -389,33 +508,41 @@ class PostLexConnector:
 
 
 def create_basic_lexer(lexer_conf, parser, postlex, options) -> BasicLexer:
-    cls = (options and options._plugins.get('BasicLexer')) or BasicLexer
+    cls = _plugin_class(options, 'BasicLexer', BasicLexer)
     return cls(lexer_conf)
 
 def create_contextual_lexer(lexer_conf: LexerConf, parser, postlex, options) -> ContextualLexer:
-    cls = (options and options._plugins.get('ContextualLexer')) or ContextualLexer
+    cls = _plugin_class(options, 'ContextualLexer', ContextualLexer)
     parse_table: ParseTableBase[int] = parser._parse_table
-    states: Dict[int, Collection[str]] = {idx:list(t.keys()) for idx, t in parse_table.states.items()}
+    states: Dict[int, Collection[str]] = {idx:t.keys() for idx, t in parse_table.states.items()}
     always_accept: Collection[str] = postlex.always_accept if postlex else ()
     return cls(lexer_conf, states, always_accept=always_accept)
 
 def create_lalr_parser(lexer_conf: LexerConf, parser_conf: ParserConf, options=None) -> LALR_Parser:
     debug = options.debug if options else False
     strict = options.strict if options else False
-    cls = (options and options._plugins.get('LALR_Parser')) or LALR_Parser
+    cls = _plugin_class(options, 'LALR_Parser', LALR_Parser)
     return cls(parser_conf, debug=debug, strict=strict)
 
 _parser_creators['lalr'] = create_lalr_parser
 
+_lexer_creators: 'Dict[str, Callable[[LexerConf, Any, Any, Any], Lexer]]' = {
+    'basic': create_basic_lexer,
+    'contextual': create_contextual_lexer,
+}
+
 ###}
 
 class EarleyRegexpMatcher:
+    __slots__ = ('regexps', '_match_by_name')
+
     def __init__(self, lexer_conf):
         self.regexps = {}
         for t in lexer_conf.terminals:
             regexp = t.pattern.to_regexp()
             try:
-                width = get_regexp_width(regexp)[0]
+                # Reuses the width the pattern memoized during grammar loading, instead of re-parsing the regexp
+                width = t.pattern.min_width
             except ValueError:
                 raise GrammarError("Bad regexp in token %s: %s" % (t.name, regexp))
             else:
@@ -426,8 +553,11 @@ class EarleyRegexpMatcher:
 
             self.regexps[t.name] = lexer_conf.re_module.compile(regexp, lexer_conf.g_regex_flags)
 
+        # Bound match methods, to skip an attribute lookup on every scan
+        self._match_by_name = {name: regexp.match for name, regexp in self.regexps.items()}
+
     def match(self, term, text, index=0):
-        return self.regexps[term.name].match(text, index)
+        return self._match_by_name[term.name](text, index)
 
 
 def create_earley_parser__dynamic(lexer_conf: LexerConf, parser_conf: ParserConf, **kw):
@@ -463,6 +593,8 @@ def create_earley_parser(lexer_conf: LexerConf, parser_conf: ParserConf, options
 
 
 class CYK_FrontEnd:
+    __slots__ = ('parser', 'callbacks')
+
     def __init__(self, lexer_conf, parser_conf, options=None):
         self.parser = cyk.Parser(parser_conf.rules)
 
@@ -474,14 +606,26 @@ class CYK_FrontEnd:
         return self._transform(tree)
 
     def _transform(self, tree):
-        subtrees = list(tree.iter_subtrees())
-        for subtree in subtrees:
-            subtree.children = [self._apply_callback(c) if isinstance(c, Tree) else c for c in subtree.children]
-
-        return self._apply_callback(tree)
-
-    def _apply_callback(self, tree):
-        return self.callbacks[tree.rule](tree.children)
+        # Post-order walk, so each node's children are rewritten before the callbacks are applied to them.
+        # Like iter_subtrees(), shared subtrees are only visited once (the tree may be a DAG).
+        # The CYK parser only builds plain Tree instances, so an exact type test is enough.
+        callbacks = self.callbacks
+        seen = set()
+        mark_seen = seen.add
+        stack = [(tree, False)]
+        pop = stack.pop
+        push = stack.append
+        _Tree = Tree
+        while stack:
+            node, children_done = pop()
+            if children_done:
+                node.children = [callbacks[c.rule](c.children) if type(c) is _Tree else c for c in node.children]
+            elif id(node) not in seen:
+                mark_seen(id(node))
+                push((node, True))
+                stack += [(c, False) for c in node.children if type(c) is _Tree]
+
+        return callbacks[tree.rule](tree.children)
 
 
 _parser_creators['earley'] = create_earley_parser
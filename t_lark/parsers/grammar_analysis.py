@@ -137,6 +137,27 @@ def calculate_sets(rules):
     return FIRST, FOLLOW, NULLABLE
 
 
+def validate_rules(parser_conf: ParserConf) -> None:
+    """Raises the GrammarErrors that GrammarAnalyzer would, for duplicate or undefined rules,
+    without building any of the analysis.
+    """
+    rules = parser_conf.rules
+    if len(rules) != len(set(rules)):
+        duplicates = [item for item, count in Counter(rules).items() if count > 1]
+        raise GrammarError("Rules defined twice: %s" % ', '.join(str(i) for i in duplicates))
+
+    defined = {r.origin for r in rules}
+    for r in rules:
+        for sym in r.expansion:
+            if not (sym.is_term or sym in defined):
+                raise GrammarError("Using an undefined rule: %s" % sym)
+
+    for start in parser_conf.start:
+        sym = NonTerminal(start)
+        if sym not in defined:
+            raise GrammarError("Using an undefined rule: %s" % sym)
+
+
 class GrammarAnalyzer:
     def __init__(self, parser_conf: ParserConf, debug: bool=False, strict: bool=False):
         self.debug = debug
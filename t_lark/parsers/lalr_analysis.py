@@ -25,6 +25,9 @@ class Action:
         return self.name
     def __repr__(self):
         return str(self)
+    def __reduce__(self):
+        # Unpickle to the module-level singleton, since parsers compare actions by identity
+        return self.name
 
 Shift = Action('Shift')
 Reduce = Action('Reduce')
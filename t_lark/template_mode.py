@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Set, Tuple, cast
+from typing import DefaultDict, Dict, Iterator, Mapping, Optional, Sequence, Set, Tuple, cast
 
 from .common import LexerConf, ParserConf
 from .grammar import NonTerminal, Rule, RuleOptions, Terminal
@@ -14,6 +15,11 @@ from .utils import TextSlice
 
 
 _SANITIZE_RE = re.compile(r"[^0-9A-Z_]")
+# ASCII-only equivalent of _SANITIZE_RE, for use with str.translate
+_SANITIZE_TABLE = {
+    code: '_' for code in range(128)
+    if not (chr(code).isdigit() or 'A' <= chr(code) <= 'Z' or chr(code) == '_')
+}
 
 
 def basic_lexer_for_static(lexer_conf: LexerConf) -> BasicLexer:
@@ -64,25 +70,29 @@ class TemplateContext:
     typed_terminals: Mapping[str, str]
     pyobj_types: Mapping[str, type | tuple[type, ...]]
     source_info: Optional[SourceInfo] = None
+    # Lexer for the static segments. Built from lexer_conf when not provided.
+    static_lexer: Optional[BasicLexer] = None
 
 
 class _TemplateLexer:
     """Adapter that exposes `lex` for Earley parser consumption."""
 
+    __slots__ = ('_template', '_ctx')
+
     def __init__(self, template, ctx: TemplateContext):
         self._template = template
         self._ctx = ctx
-        self._used = False
 
     def lex(self, parser_state):
-        if self._used:
+        template = self._template
+        if template is None:    # Already consumed
             return iter(())
-        self._used = True
-        token_iter: Iterable[Token] = _iterate_template_tokens(self._template, self._ctx, parser_state)
+        self._template = None
+        token_iter: Iterator[Token] = _iterate_template_tokens(template, self._ctx, parser_state)
         postlex = self._ctx.lexer_conf.postlex
         if postlex is not None:
-            token_iter = postlex.process(iter(token_iter))
-        return iter(token_iter)
+            return iter(postlex.process(token_iter))
+        return token_iter
 
 
 def tokenize_template(template, ctx: TemplateContext) -> _TemplateLexer:
@@ -92,7 +102,9 @@ def tokenize_template(template, ctx: TemplateContext) -> _TemplateLexer:
 
 
 def _iterate_template_tokens(template, ctx: TemplateContext, parser_state) -> Iterator[Token]:
-    basic_lexer = basic_lexer_for_static(ctx.lexer_conf)
+    basic_lexer = ctx.static_lexer
+    if basic_lexer is None:
+        basic_lexer = basic_lexer_for_static(ctx.lexer_conf)
     strings = template.strings
     interpolations = template.interpolations
 
@@ -226,21 +238,27 @@ def splice_inserted_trees(node):
         return
 
     new_children = []
+    append = new_children.append
     for child in node.children:
-        if isinstance(child, Token) and child.type.startswith("TREE__") and isinstance(child.value, Tree):
-            splice_inserted_trees(child.value)
-            new_children.append(child.value)
-        else:
-            if isinstance(child, Tree):
-                splice_inserted_trees(child)
-            new_children.append(child)
+        if isinstance(child, Token):
+            value = child.value
+            if child.type.startswith("TREE__") and isinstance(value, Tree):
+                splice_inserted_trees(value)
+                append(value)
+                continue
+        elif isinstance(child, Tree):
+            splice_inserted_trees(child)
+        append(child)
 
     node.children = new_children
 
 
 def _make_tree_terminal_name(label: str) -> str:
     upper = label.upper()
-    safe = _SANITIZE_RE.sub('_', upper)
+    if upper.isascii():
+        safe = upper.translate(_SANITIZE_TABLE)
+    else:
+        safe = _SANITIZE_RE.sub('_', upper)
     return f"TREE__{safe}"
 
 
@@ -252,46 +270,49 @@ def augment_grammar_for_template_mode(lexer_conf: LexerConf, parser_conf: Parser
         return existing
 
     label_map: Dict[str, str] = {}
-    labels_per_nonterminal: Dict[NonTerminal, Set[str]] = {}
-
-    for rule in parser_conf.rules:
-        labels = labels_per_nonterminal.setdefault(rule.origin, set())
-        label = rule.alias if rule.alias else rule.origin.name
-        labels.add(str(label))
-
-    terminals = list(lexer_conf.terminals)
-    terminals_by_name = dict(lexer_conf.terminals_by_name)
-
-    for labels in labels_per_nonterminal.values():
-        for label in labels:
-            term_name = _make_tree_terminal_name(label)
-            label_map[label] = term_name
-            if term_name in terminals_by_name:
-                continue
-            terminals.append(TerminalDef(term_name, PatternTree(label)))
-            terminals_by_name[term_name] = terminals[-1]
-
-    lexer_conf.terminals = terminals
-    lexer_conf.terminals_by_name = terminals_by_name
-
-    existing_expansions: Set[Tuple[NonTerminal, Tuple[str, ...]]] = set()
+    labels_per_nonterminal: DefaultDict[NonTerminal, Set[str]] = defaultdict(set)
     max_order: Dict[NonTerminal, int] = {}
+    # Only single-symbol expansions can clash with an injection rule.
+    # Keyed on names, so membership tests hash plain strings.
+    existing_expansions: Set[Tuple[str, str]] = set()
+
     for rule in parser_conf.rules:
-        expansion = tuple(symbol.name for symbol in rule.expansion)
-        existing_expansions.add((rule.origin, expansion))
-        max_order[rule.origin] = max(max_order.get(rule.origin, -1), rule.order)
+        origin = rule.origin
+        label = str(rule.alias if rule.alias else origin.name)
+        labels_per_nonterminal[origin].add(label)
+        if label not in label_map:
+            label_map[label] = _make_tree_terminal_name(label)
+        max_order[origin] = max(max_order.get(origin, -1), rule.order)
+        if len(rule.expansion) == 1:
+            existing_expansions.add((origin.name, rule.expansion[0].name))
+
+    # Distinct labels may sanitize to the same terminal name; the first label wins
+    tree_labels: Dict[str, str] = {}
+    for label, term_name in label_map.items():
+        tree_labels.setdefault(term_name, label)
+    tree_symbols = {term_name: Terminal(term_name) for term_name in tree_labels}
+
+    new_terminals = [
+        TerminalDef(term_name, PatternTree(label))
+        for term_name, label in tree_labels.items()
+        if term_name not in lexer_conf.terminals_by_name
+    ]
+    lexer_conf.terminals = [*lexer_conf.terminals, *new_terminals]
+    lexer_conf.terminals_by_name = {**lexer_conf.terminals_by_name, **{t.name: t for t in new_terminals}}
 
     new_rules: list[Rule] = []
+    # Shared by this grammar's injection rules only, so edits through one parser's rules don't reach another's
+    injection_options = RuleOptions(expand1=True)
 
     for origin, labels in labels_per_nonterminal.items():
-        order = max_order.get(origin, -1) + 1
+        order = max_order[origin] + 1
         for label in labels:
             term_name = label_map[label]
-            key = (origin, (term_name,))
+            key = (origin.name, term_name)
             if key in existing_expansions:
                 continue
-            symbol = Terminal(term_name)
-            new_rules.append(Rule(origin, [symbol], order, alias=None, options=RuleOptions(expand1=True)))
+            symbol = tree_symbols[term_name]
+            new_rules.append(Rule(origin, [symbol], order, alias=None, options=injection_options))
             existing_expansions.add(key)
             order += 1
 
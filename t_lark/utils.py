@@ -8,6 +8,8 @@ from typing import Callable, Iterator, List, Optional, Tuple, Type, TypeVar, Uni
 import sys, re
 import logging
 from dataclasses import dataclass
+from importlib import import_module
+from types import ModuleType
 from typing import Generic, AnyStr
 
 logger: logging.Logger = logging.getLogger("t_lark")
@@ -34,6 +36,22 @@ def classify(seq: Iterable, key: Optional[Callable] = None, value: Optional[Call
     return d
 
 
+def _getstate_by_module_name(obj: Any) -> Dict[str, Any]:
+    """Returns obj.__dict__ for pickling, with module attributes (re/regex) stored by name"""
+    state = dict(obj.__dict__)
+    modules = {k: v.__name__ for k, v in state.items() if isinstance(v, ModuleType)}
+    state.update(modules)
+    state['__modules__'] = tuple(modules)
+    return state
+
+
+def _setstate_by_module_name(obj: Any, state: Dict[str, Any]) -> None:
+    state = dict(state)
+    for k in state.pop('__modules__', ()):
+        state[k] = import_module(state[k])
+    obj.__dict__.update(state)
+
+
 def _deserialize(data: Any, namespace: Dict[str, Any], memo: Dict) -> Any:
     if isinstance(data, dict):
         if '__type__' in data:  # Object
@@ -57,6 +75,7 @@ class Serialize:
         __serialize_namespace__ (list): List of classes that deserialization is allowed to instantiate.
                                         Should include all field types that aren't builtin types.
     """
+    __slots__ = ()
 
     def memo_serialize(self, types_to_memoize: List) -> Any:
         memo = SerializeMemoizer(types_to_memoize)
@@ -75,14 +94,17 @@ class Serialize:
 
     @classmethod
     def deserialize(cls: Type[_T], data: Dict[str, Any], memo: Dict[int, Any]) -> _T:
-        namespace = getattr(cls, '__serialize_namespace__', [])
-        namespace = {c.__name__:c for c in namespace}
-
-        fields = getattr(cls, '__serialize_fields__')
-
         if '@' in data:
             return memo[data['@']]
 
+        # Built once per class, since deserialize runs for every rule and symbol being loaded
+        namespace = cls.__dict__.get('_deserialize_namespace')
+        if namespace is None:
+            namespace = {c.__name__:c for c in getattr(cls, '__serialize_namespace__', [])}
+            setattr(cls, '_deserialize_namespace', namespace)
+
+        fields = getattr(cls, '__serialize_fields__')
+
         inst = cls.__new__(cls)
         for f in fields:
             try:
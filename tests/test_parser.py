@@ -171,6 +171,28 @@ class TestParsers(unittest.TestCase):
         r = p.parse("x")
         self.assertEqual( r.children, ["X!"] )
 
+    def test_visit_tokens_instance_callback(self):
+        # Terminal callbacks may also be set on the transformer instance
+        t = Transformer()
+        t.A = lambda tok: tok.update(value=tok.upper())
+        p = Lark("""start: A
+                    A: "x"
+                 """, parser='lalr', transformer=t)
+        self.assertEqual( p.parse("x").children, ["X"] )
+
+    def test_visit_tokens_getattribute_callback(self):
+        # Terminal callbacks may also be provided by a custom __getattribute__
+        class T(Transformer):
+            def __getattribute__(self, name):
+                if name == 'A':
+                    return lambda tok: tok.update(value=tok.upper())
+                return super().__getattribute__(name)
+
+        p = Lark("""start: A
+                    A: "x"
+                 """, parser='lalr', transformer=T())
+        self.assertEqual( p.parse("x").children, ["X"] )
+
     def test_visit_tokens2(self):
         g = """
         start: add+
@@ -370,6 +392,32 @@ class TestParsers(unittest.TestCase):
         r = p.parse('')
         self.assertEqual(r, Tree('start', [Token('A', 'A')]))
 
+    def test_custom_lexer_wrapper_not_kept_alive(self):
+        import gc
+        import weakref
+
+        def make_parser():
+            class OldCustomLexer(Lexer):
+                def __init__(self, lexer_conf):
+                    pass
+
+                def lex(self, text):
+                    yield Token('A', 'A')
+
+            g = """
+            start: A
+            %declare A
+            """
+            p1 = Lark(g, parser='lalr', lexer=OldCustomLexer)
+            p2 = Lark(g, parser='lalr', lexer=OldCustomLexer)
+            # Both frontends share one wrapper class
+            self.assertIs(type(p1.parser.lexer), type(p2.parser.lexer))
+            return weakref.ref(OldCustomLexer)
+
+        ref = make_parser()
+        gc.collect()
+        self.assertIsNone(ref())
+
 
     def test_lexer_token_limit(self):
         "Python has a stupid limit of 100 groups in a regular expression. Test that we handle this limitation"
@@ -2435,6 +2483,18 @@ def _make_parser_test(LEXER, PARSER):
             parser2 = Lark.load(s)
             self.assertEqual(parser2.parse('ABC'), Tree('start', [Tree('b', [])]) )
 
+        @unittest.skipIf(LEXER.startswith('custom'), "Custom lexers are defined locally and can't be pickled")
+        def test_pickle_parser_frontend(self):
+            import pickle
+            parser = _Lark("""
+                start: _ANY b "C"
+                _ANY: /./
+                b: "B"
+            """)
+            self.assertEqual(parser.parse('ABC'), Tree('start', [Tree('b', [])]))
+            frontend = pickle.loads(pickle.dumps(parser.parser))
+            self.assertEqual(frontend.parse('ABC'), Tree('start', [Tree('b', [])]))
+
         def test_multi_start(self):
             parser = _Lark('''
                 a: "x" "a"?
@@ -13,7 +13,7 @@ implementation intact. The coverage mirrors that suite's structure:
 import unittest
 
 from t_lark import Lark, Tree
-from t_lark.exceptions import ConfigurationError, UnexpectedToken
+from t_lark.exceptions import ConfigurationError, GrammarError, UnexpectedToken
 
 
 class TestTemplateModeBasics(unittest.TestCase):
@@ -96,6 +96,48 @@ class TestTemplateModeBasics(unittest.TestCase):
         result = parser.parse(t"static {100} {chunk}", start='start')
         self.assertEqual(result.data, 'start')
 
+    def test_pickle_frontend(self):
+        """The template frontend should survive a pickle round-trip."""
+        import pickle
+
+        grammar = r"""
+        %import template (PYOBJ)
+        start: "value:" PYOBJ[num]
+        """
+        parser = Lark(grammar, parser="earley", lexer="template", pyobj_types={'num': int})
+
+        frontend = pickle.loads(pickle.dumps(parser.parser))
+        self.assertEqual(frontend.parse(t"value:{7}"), parser.parse(t"value:{7}"))
+
+    def test_warmup(self):
+        """warmup() builds the Earley parser ahead of the first parse."""
+        grammar = r"""
+        %import template (PYOBJ)
+        start: "value:" PYOBJ
+        """
+        parser = Lark(grammar, parser="earley", lexer="template")
+
+        frontend = parser.parser
+        frontend.warmup()
+        earley_parser = frontend.parser
+        self.assertIsNotNone(parser.parse(t"value:{7}"))
+        self.assertIs(frontend.parser, earley_parser)
+
+    def test_injection_rule_options_not_shared(self):
+        """Tree-injection rule options should not leak between parsers."""
+        grammar = r"""
+        start: item+
+        item: "x"
+        """
+        a = Lark(grammar, parser="earley", lexer="template")
+        b = Lark(grammar, parser="earley", lexer="template")
+
+        def injected(parser):
+            return [r for r in parser.rules if r.expansion[0].name.startswith("TREE__")]
+
+        injected(a)[0].options.priority = 5
+        self.assertTrue(all(r.options.priority is None for r in injected(b)))
+
     def test_source_info_absent(self):
         """Template objects without source metadata should still parse."""
         grammar = r"""
@@ -159,6 +201,11 @@ class TestTemplateModeErrors(unittest.TestCase):
 
         self.assertIn("unknown", str(ctx.exception))
 
+    def test_undefined_start_fails_at_construction(self):
+        """Grammar errors should surface when the parser is built, not on first parse."""
+        with self.assertRaises(GrammarError):
+            Lark('start: "a"\n', parser="earley", lexer="template", start=['start', 'missing'])
+
     def test_requires_earley_parser(self):
         """Template mode requires the Earley parser backend."""
         grammar = 'start: "x"'